@@ -57,7 +57,7 @@ struct AppState {
 }
 
 /// Handler for GET /v1/ping
-#[tracing::instrument]
+#[tracing::instrument(level = "debug")]
 async fn ping() -> impl IntoResponse {
     tracing::debug!("Handling /v1/ping request");
     (
@@ -69,7 +69,7 @@ async fn ping() -> impl IntoResponse {
 }
 
 /// Handler for GET /v1/info
-#[tracing::instrument(skip(state))]
+#[tracing::instrument(level = "debug", skip(state))]
 async fn info(State(state): State<Arc<AppState>>) -> impl IntoResponse {
     tracing::debug!("Handling /v1/info request");
 
@@ -88,7 +88,7 @@ async fn info(State(state): State<Arc<AppState>>) -> impl IntoResponse {
 }
 
 /// Handler for GET /v1/state
-#[tracing::instrument(skip(state))]
+#[tracing::instrument(level = "debug", skip(state))]
 async fn get_state(State(state): State<Arc<AppState>>) -> impl IntoResponse {
     tracing::debug!("Handling /v1/state request");
 
@@ -98,7 +98,7 @@ async fn get_state(State(state): State<Arc<AppState>>) -> impl IntoResponse {
 }
 
 /// Handler for POST /v1/entities/:id/command
-#[tracing::instrument(skip(state))]
+#[tracing::instrument(level = "debug", skip(state))]
 async fn send_entity_command(
     State(state): State<Arc<AppState>>,
     Path(entity_id): Path<String>,
@@ -6,6 +6,7 @@ use arc_swap::ArcSwap;
 use tokio::sync::Mutex;
 use tokio::sync::mpsc;
 use tokio::task::JoinHandle;
+use tracing::debug;
 use tracing::error;
 use tracing::info;
 use tracing::warn;
@@ -32,9 +33,6 @@ pub struct Engine {
     /// Centralized state snapshot (readers load the Arc, writer stores a new one)
     state: ArcSwap<State>,
 
-    /// Map of NodeId -> integration name for routing commands.
-    node_integration_map: std::sync::Mutex<HashMap<NodeId, String>>,
-
     /// Communication channels to integrations (for commands)
     integration_channels: HashMap<String, ToIntegrationSender>,
 
@@ -52,13 +50,15 @@ pub struct Engine {
 /// Provides backpressure when integrations send faster than the engine can process
 const FROM_INTEGRATION_CHANNEL_SIZE: usize = 1024;
 
+/// Maximum number of queued integration messages applied per state snapshot
+const EVENT_BATCH_SIZE: usize = 64;
+
 impl Engine {
     /// Create a new Engine instance
     pub fn new() -> Self {
         let (message_tx, message_rx) = mpsc::channel(FROM_INTEGRATION_CHANNEL_SIZE);
         Self {
             state: ArcSwap::new(Arc::default()),
-            node_integration_map: std::sync::Mutex::new(HashMap::new()),
             integration_channels: HashMap::new(),
             message_rx: Mutex::new(message_rx),
             message_tx,
@@ -127,26 +127,25 @@ impl Engine {
 
     /// Send a command to an integration.
     ///
-    /// Routes the command to the integration that owns the target node.
+    /// Routes the command to the integration that owns the target node, as
+    /// recorded on the node in the current state snapshot.
     pub fn send_command(&self, msg: ToIntegrationMessage) -> Result<(), Box<dyn Error + Send>> {
         let node_id = match &msg {
             ToIntegrationMessage::InvokeCommand { node_id, .. } => *node_id,
         };
 
-        let map = self
-            .node_integration_map
-            .lock()
-            .map_err(|e| -> Box<dyn Error + Send> {
-                Box::new(std::io::Error::other(e.to_string()))
+        let state = self.state.load();
+        let integration_name = state
+            .nodes
+            .get(&node_id)
+            .map(|node| node.integration.as_str())
+            .ok_or_else(|| -> Box<dyn Error + Send> {
+                Box::new(std::io::Error::new(
+                    std::io::ErrorKind::NotFound,
+                    format!("No integration found for node: {}", node_id),
+                ))
             })?;
 
-        let integration_name = map.get(&node_id).ok_or_else(|| -> Box<dyn Error + Send> {
-            Box::new(std::io::Error::new(
-                std::io::ErrorKind::NotFound,
-                format!("No integration found for node: {}", node_id),
-            ))
-        })?;
-
         let tx = self.integration_channels.get(integration_name).ok_or_else(
             || -> Box<dyn Error + Send> {
                 Box::new(std::io::Error::new(
@@ -166,12 +165,13 @@ impl Engine {
     pub async fn run(&self) -> Result<(), Box<dyn Error + Send>> {
         info!("Engine starting");
 
-        // Main event loop - only receives FromIntegration messages
+        // Main event loop - only receives FromIntegration messages. Everything
+        // already queued is drained at once so a burst (e.g. a discovery flood)
+        // costs one state clone and one store rather than one per message.
         let mut rx = self.message_rx.lock().await;
-        while let Some(msg) = rx.recv().await {
-            if let Err(e) = self.handle_event(msg).await {
-                warn!("Error handling event: {}", e);
-            }
+        let mut batch = Vec::with_capacity(EVENT_BATCH_SIZE);
+        while rx.recv_many(&mut batch, EVENT_BATCH_SIZE).await > 0 {
+            self.handle_events(batch.drain(..));
         }
 
         info!("Engine shutting down");
@@ -204,8 +204,26 @@ impl Engine {
         })
     }
 
+    /// Apply a batch of events from integrations to the state snapshot.
+    ///
+    /// The snapshot is cloned and published once for the whole batch, so
+    /// readers never observe a partially applied batch.
+    fn handle_events(&self, msgs: impl Iterator<Item = FromIntegrationMessage>) {
+        let mut state = State::clone(&self.state.load());
+        for msg in msgs {
+            if let Err(e) = self.handle_event(&mut state, msg) {
+                warn!("Error handling event: {}", e);
+            }
+        }
+        self.state.store(Arc::new(state));
+    }
+
     /// Handle an event from an integration
-    async fn handle_event(&self, msg: FromIntegrationMessage) -> Result<(), Box<dyn Error + Send>> {
+    fn handle_event(
+        &self,
+        state: &mut State,
+        msg: FromIntegrationMessage,
+    ) -> Result<(), Box<dyn Error + Send>> {
         match msg {
             FromIntegrationMessage::NodeAdded { node_id, node } => {
                 info!(
@@ -213,30 +231,14 @@ impl Engine {
                     node_id, node.entity_id, node.integration
                 );
 
-                if let Ok(mut map) = self.node_integration_map.lock() {
-                    map.insert(node_id, node.integration.clone());
-                }
-
-                {
-                    let mut state = State::clone(&self.state.load());
-                    state.by_entity_id.insert(node.entity_id.clone(), node_id);
-                    state.nodes.insert(node_id, node);
-                    self.state.store(Arc::new(state));
-                }
+                state.by_entity_id.insert(node.entity_id.clone(), node_id);
+                state.nodes.insert(node_id, node);
             }
             FromIntegrationMessage::NodeRemoved { node_id } => {
                 info!("Node removed: {}", node_id);
 
-                {
-                    let mut state = State::clone(&self.state.load());
-                    if let Some(node) = state.nodes.remove(&node_id) {
-                        state.by_entity_id.remove(&node.entity_id);
-                    }
-                    self.state.store(Arc::new(state));
-                }
-
-                if let Ok(mut map) = self.node_integration_map.lock() {
-                    map.remove(&node_id);
+                if let Some(node) = state.nodes.remove(&node_id) {
+                    state.by_entity_id.remove(&node.entity_id);
                 }
             }
             FromIntegrationMessage::AttributeChanged {
@@ -244,22 +246,23 @@ impl Engine {
                 endpoint_id,
                 cluster,
             } => {
-                info!(
+                debug!(
                     "Attribute changed: node={} endpoint={} cluster={}",
                     node_id,
                     endpoint_id,
                     cluster.name()
                 );
 
-                {
-                    let mut state = State::clone(&self.state.load());
-                    if let Some(node) = state.nodes.get_mut(&node_id) {
-                        let endpoint = node.endpoints.entry(endpoint_id).or_default();
-                        endpoint
-                            .clusters
-                            .insert(cluster.name().to_string(), cluster.clone());
+                if let Some(node) = state.nodes.get_mut(&node_id) {
+                    let clusters = &mut node.endpoints.entry(endpoint_id).or_default().clusters;
+                    // Overwrite known clusters in place so the common update path
+                    // doesn't allocate a fresh key string.
+                    match clusters.get_mut(cluster.name()) {
+                        Some(existing) => *existing = cluster.clone(),
+                        None => {
+                            clusters.insert(cluster.name().to_string(), cluster.clone());
+                        }
                     }
-                    self.state.store(Arc::new(state));
                 }
 
                 let _event = match cluster {
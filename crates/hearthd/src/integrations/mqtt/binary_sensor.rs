@@ -3,6 +3,7 @@ use std::fmt;
 
 use serde::Deserialize;
 use serde::Serialize;
+use strum::IntoStaticStr;
 
 use crate::integrations::mqtt::discovery::DeviceInfo;
 use crate::integrations::mqtt::discovery::DiscoveryMessage;
@@ -13,8 +14,10 @@ use crate::matter::Node;
 use crate::matter::OccupancySensingCluster;
 
 /// Device class for binary sensors, matching Home Assistant's binary_sensor device classes.
-#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize, IntoStaticStr)]
+#[cfg_attr(test, derive(strum::EnumIter))]
 #[serde(rename_all = "snake_case")]
+#[strum(serialize_all = "snake_case")]
 pub enum BinarySensorDeviceClass {
     Battery,
     BatteryCharging,
@@ -48,19 +51,22 @@ pub enum BinarySensorDeviceClass {
     Unknown(String),
 }
 
-impl fmt::Display for BinarySensorDeviceClass {
-    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+impl BinarySensorDeviceClass {
+    /// Home Assistant's snake_case name for this device class.
+    pub fn as_str(&self) -> &str {
         match self {
-            Self::Unknown(s) => write!(f, "{}", s),
-            other => {
-                // Use the Debug repr lowercased with underscores via serde
-                let json = serde_json::to_value(other).unwrap();
-                write!(f, "{}", json.as_str().unwrap())
-            }
+            Self::Unknown(s) => s.as_str(),
+            known => known.into(),
         }
     }
 }
 
+impl fmt::Display for BinarySensorDeviceClass {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str(self.as_str())
+    }
+}
+
 impl From<String> for BinarySensorDeviceClass {
     fn from(s: String) -> Self {
         match s.as_str() {
@@ -115,7 +121,9 @@ pub struct BinarySensor {
     pub device_info: Option<DeviceInfo>,
 
     pub state_topic: String,
-    value_template: Option<String>,
+    /// JSON key carrying the sensor state, resolved once from the discovery
+    /// value template (falls back to `"state"`).
+    state_key: String,
 
     pub occupancy: OccupancySensingCluster,
 }
@@ -153,6 +161,13 @@ impl BinarySensor {
 
         let device_class = discovery.device_class.map(BinarySensorDeviceClass::from);
 
+        let state_key = discovery
+            .value_template
+            .as_deref()
+            .and_then(parse_value_template_key)
+            .unwrap_or("state")
+            .to_string();
+
         Ok(Self {
             entity_id,
             name,
@@ -160,7 +175,7 @@ impl BinarySensor {
             device_class,
             device_info: discovery.device,
             state_topic,
-            value_template: discovery.value_template,
+            state_key,
             occupancy: OccupancySensingCluster::default(),
         })
     }
@@ -190,22 +205,18 @@ impl BinarySensor {
         &mut self,
         payload: &[u8],
     ) -> Result<Option<Cluster>, Box<dyn Error>> {
-        let json_str = std::str::from_utf8(payload)?;
-        let state_update: serde_json::Value = serde_json::from_str(json_str)?;
-
-        let key = self
-            .value_template
-            .as_deref()
-            .and_then(parse_value_template_key)
-            .unwrap_or("state");
+        let state_update: serde_json::Value = serde_json::from_slice(payload)?;
 
-        if let Some(value) = state_update.get(key) {
-            self.occupancy.occupancy = match value {
+        if let Some(value) = state_update.get(self.state_key.as_str()) {
+            let occupancy = match value {
                 serde_json::Value::Bool(b) => *b,
                 serde_json::Value::String(s) => s == "ON" || s == "true",
                 _ => false,
             };
-            return Ok(Some(Cluster::OccupancySensing(self.occupancy.clone())));
+            if occupancy != self.occupancy.occupancy {
+                self.occupancy.occupancy = occupancy;
+                return Ok(Some(Cluster::OccupancySensing(self.occupancy.clone())));
+            }
         }
 
         Ok(None)
@@ -214,6 +225,8 @@ impl BinarySensor {
 
 #[cfg(test)]
 mod tests {
+    use strum::IntoEnumIterator;
+
     use super::*;
 
     fn motion_discovery() -> DiscoveryMessage {
@@ -246,6 +259,7 @@ mod tests {
         assert_eq!(sensor.name, "Living Room Motion");
         assert_eq!(sensor.device_class, Some(BinarySensorDeviceClass::Motion));
         assert_eq!(sensor.state_topic, "zigbee2mqtt/motion_sensor");
+        assert_eq!(sensor.state_key, "occupancy");
         assert!(!sensor.occupancy.occupancy);
     }
 
@@ -283,6 +297,29 @@ mod tests {
         assert!(!sensor.occupancy.occupancy);
     }
 
+    #[test]
+    fn apply_state_payload_skips_unchanged_occupancy() {
+        let mut sensor = BinarySensor::from_discovery(
+            motion_discovery(),
+            "binary_sensor.test".to_string(),
+            "test".to_string(),
+        )
+        .unwrap();
+
+        let changed = sensor
+            .apply_state_payload(br#"{"occupancy": false, "battery": 95}"#)
+            .unwrap();
+        assert!(changed.is_none());
+
+        sensor
+            .apply_state_payload(br#"{"occupancy": true}"#)
+            .unwrap();
+        let changed = sensor
+            .apply_state_payload(br#"{"occupancy": true, "battery": 94}"#)
+            .unwrap();
+        assert!(changed.is_none());
+    }
+
     #[test]
     fn apply_state_payload_falls_back_to_state_key() {
         let mut discovery = motion_discovery();
@@ -293,11 +330,26 @@ mod tests {
             "test".to_string(),
         )
         .unwrap();
+        assert_eq!(sensor.state_key, "state");
 
         sensor.apply_state_payload(br#"{"state": "ON"}"#).unwrap();
         assert!(sensor.occupancy.occupancy);
     }
 
+    #[test]
+    fn device_class_display_matches_serde_name() {
+        for class in BinarySensorDeviceClass::iter() {
+            if matches!(class, BinarySensorDeviceClass::Unknown(_)) {
+                continue;
+            }
+            let name = class.to_string();
+            assert_eq!(serde_json::to_value(&class).unwrap(), name.as_str());
+            assert_eq!(BinarySensorDeviceClass::from(name), class);
+        }
+        let custom = BinarySensorDeviceClass::from("custom".to_string());
+        assert_eq!(custom.to_string(), "custom");
+    }
+
     #[test]
     fn parse_value_template_key_examples() {
         assert_eq!(
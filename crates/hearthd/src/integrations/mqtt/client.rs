@@ -39,10 +39,13 @@ pub trait MqttClient: Send + Sync {
         retain: bool,
     ) -> Result<(), Box<dyn Error + Send>>;
 
-    /// Poll for the next message from subscribed topics
+    /// Take the stream of messages from subscribed topics
     ///
-    /// Returns None if no message is available or if the client should stop
-    async fn poll_message(&mut self) -> Option<MqttMessage>;
+    /// The receiver is handed out once so a single reader task can own it
+    /// without holding the client lock, leaving the client free for
+    /// publishes and subscribes. Returns None if not connected or if the
+    /// stream has already been taken.
+    fn take_messages(&mut self) -> Option<mpsc::UnboundedReceiver<MqttMessage>>;
 }
 
 /// Mock MQTT client for testing
@@ -53,6 +56,8 @@ pub struct MockMqttClient {
     pub subscriptions: Vec<String>,
     pub published: Vec<(String, Vec<u8>, bool)>,
     pub is_connected: bool,
+    /// Set once take_messages() has handed out the stream
+    pub messages_taken: bool,
 }
 
 #[cfg(test)]
@@ -79,8 +84,17 @@ impl MqttClient for MockMqttClient {
         Ok(())
     }
 
-    async fn poll_message(&mut self) -> Option<MqttMessage> {
-        self.messages.pop()
+    fn take_messages(&mut self) -> Option<mpsc::UnboundedReceiver<MqttMessage>> {
+        if self.messages_taken {
+            return None;
+        }
+        self.messages_taken = true;
+
+        let (tx, rx) = mpsc::unbounded_channel();
+        for msg in self.messages.drain(..) {
+            let _ = tx.send(msg);
+        }
+        Some(rx)
     }
 }
 
@@ -92,7 +106,6 @@ impl MockMqttClient {
     }
 
     /// Add a message to the mock client's queue
-    #[allow(dead_code)]
     pub fn add_message(&mut self, topic: String, payload: Vec<u8>, retain: bool) {
         self.messages.push(MqttMessage {
             topic,
@@ -157,9 +170,12 @@ impl MqttClient for RumqttcClient {
             loop {
                 match event_loop.poll().await {
                     Ok(Event::Incoming(Packet::Publish(publish))) => {
+                        // Move the topic out of the packet; it is already an owned
+                        // String. The payload is a slice of rumqttc's shared read
+                        // buffer, so converting it to a Vec always copies.
                         let msg = MqttMessage {
-                            topic: publish.topic.to_string(),
-                            payload: publish.payload.to_vec(),
+                            topic: publish.topic,
+                            payload: publish.payload.into(),
                             retain: publish.retain,
                         };
 
@@ -231,11 +247,8 @@ impl MqttClient for RumqttcClient {
         Ok(())
     }
 
-    async fn poll_message(&mut self) -> Option<MqttMessage> {
-        match &mut self.message_rx {
-            Some(rx) => rx.recv().await,
-            None => None,
-        }
+    fn take_messages(&mut self) -> Option<mpsc::UnboundedReceiver<MqttMessage>> {
+        self.message_rx.take()
     }
 }
 
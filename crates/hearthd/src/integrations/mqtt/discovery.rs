@@ -179,23 +179,23 @@ pub struct DeviceInfo {
 /// Topic format: {prefix}/{component}/{node_id}/{object_id}/config
 /// Example: homeassistant/light/0x00124b001234abcd/light/config
 ///
-/// Returns: (component, node_id, object_id)
-pub fn parse_discovery_topic(topic: &str, prefix: &str) -> Option<(String, String, String)> {
+/// Returns: (component, node_id, object_id), borrowed from `topic`
+pub fn parse_discovery_topic<'a>(
+    topic: &'a str,
+    prefix: &str,
+) -> Option<(&'a str, &'a str, &'a str)> {
     // Remove the discovery prefix
     let without_prefix = topic.strip_prefix(prefix)?.strip_prefix('/')?;
 
-    // Split the remaining parts
-    let parts: Vec<&str> = without_prefix.split('/').collect();
-
     // We expect at least 4 parts: component/node_id/object_id/config
-    if parts.len() < 4 || parts.last() != Some(&"config") {
+    let mut parts = without_prefix.split('/');
+    let component = parts.next()?;
+    let node_id = parts.next()?;
+    let object_id = parts.next()?;
+    if parts.next_back()? != "config" {
         return None;
     }
 
-    let component = parts[0].to_string();
-    let node_id = parts[1].to_string();
-    let object_id = parts[2].to_string();
-
     Some((component, node_id, object_id))
 }
 
@@ -207,14 +207,7 @@ mod tests {
     fn test_parse_discovery_topic() {
         let topic = "homeassistant/light/0x00124b001234abcd/light/config";
         let result = parse_discovery_topic(topic, "homeassistant");
-        assert_eq!(
-            result,
-            Some((
-                "light".to_string(),
-                "0x00124b001234abcd".to_string(),
-                "light".to_string()
-            ))
-        );
+        assert_eq!(result, Some(("light", "0x00124b001234abcd", "light")));
     }
 
     #[test]
@@ -230,11 +223,7 @@ mod tests {
         let result = parse_discovery_topic(topic, "homeassistant");
         assert_eq!(
             result,
-            Some((
-                "binary_sensor".to_string(),
-                "0x00124b001234abcd".to_string(),
-                "occupancy".to_string()
-            ))
+            Some(("binary_sensor", "0x00124b001234abcd", "occupancy"))
         );
     }
 }
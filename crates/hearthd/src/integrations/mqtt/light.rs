@@ -1,5 +1,8 @@
 use std::error::Error;
 
+use serde::Deserialize;
+use serde::Serialize;
+
 use crate::integrations::mqtt::discovery::DeviceInfo;
 use crate::integrations::mqtt::discovery::DiscoveryMessage;
 use crate::matter::Cluster;
@@ -18,6 +21,35 @@ use crate::matter::OnOffCommand;
 /// endpoint 1 (the standard Matter root application endpoint).
 pub const Z2M_ENDPOINT: EndpointId = 1;
 
+/// The subset of a Zigbee2MQTT light state payload that we consume.
+///
+/// Z2M publishes the whole device state (color, linkquality, update info,
+/// ...) on every report. Deserializing into this struct skips the other
+/// fields instead of building them into a `serde_json::Value` tree. The
+/// consumed fields stay untyped so a value of an unexpected type is ignored
+/// rather than failing the whole payload.
+#[derive(Debug, Deserialize)]
+struct StatePayload {
+    #[serde(default)]
+    state: Option<serde_json::Value>,
+    #[serde(default)]
+    brightness: Option<serde_json::Value>,
+}
+
+/// Pre-encoded Zigbee2MQTT `set` payloads for the fixed on/off commands.
+const SET_ON_PAYLOAD: &[u8] = br#"{"state":"ON"}"#;
+const SET_OFF_PAYLOAD: &[u8] = br#"{"state":"OFF"}"#;
+
+/// Zigbee2MQTT `set` payload for a brightness change.
+///
+/// Serialized directly so encoding a command doesn't build an intermediate
+/// `serde_json::Value` tree.
+#[derive(Debug, Serialize)]
+struct SetLevelPayload {
+    state: &'static str,
+    brightness: u8,
+}
+
 /// MQTT-side Light entity.
 ///
 /// Holds the Z2M metadata (topics, payloads, device info) plus the current
@@ -119,26 +151,25 @@ impl Light {
     /// `{"state": "ON", "brightness": 128}`. Both attributes ride on the
     /// same topic, so a single payload can touch both clusters.
     pub fn apply_state_payload(&mut self, payload: &[u8]) -> Result<Vec<Cluster>, Box<dyn Error>> {
-        let json_str = std::str::from_utf8(payload)?;
-        let state_update: serde_json::Value = serde_json::from_str(json_str)?;
+        let state_update: StatePayload = serde_json::from_slice(payload)?;
 
         let mut changed = Vec::new();
 
-        if let Some(state_str) = state_update.get("state").and_then(|v| v.as_str()) {
+        if let Some(state_str) = state_update.state.as_ref().and_then(|v| v.as_str()) {
             let new_on = state_str == "ON";
             if new_on != self.on_off.on_off {
                 self.on_off.on_off = new_on;
+                changed.push(Cluster::OnOff(self.on_off.clone()));
             }
-            changed.push(Cluster::OnOff(self.on_off.clone()));
         }
 
         if let Some(lc) = self.level_control.as_mut() {
-            if let Some(brightness) = state_update.get("brightness").and_then(|v| v.as_u64()) {
+            if let Some(brightness) = state_update.brightness.as_ref().and_then(|v| v.as_u64()) {
                 let new_level = Some(brightness as u8);
                 if new_level != lc.current_level {
                     lc.current_level = new_level;
+                    changed.push(Cluster::LevelControl(lc.clone()));
                 }
-                changed.push(Cluster::LevelControl(lc.clone()));
             }
         }
 
@@ -152,11 +183,14 @@ impl Light {
     /// `command_topic`. `OnOff::Toggle` uses the cached `on_off` state.
     pub fn command_payload(&self, command: &ClusterCommand) -> Result<Vec<u8>, Box<dyn Error>> {
         let payload = match command {
-            ClusterCommand::OnOff(OnOffCommand::On) => serde_json::json!({ "state": "ON" }),
-            ClusterCommand::OnOff(OnOffCommand::Off) => serde_json::json!({ "state": "OFF" }),
+            ClusterCommand::OnOff(OnOffCommand::On) => SET_ON_PAYLOAD,
+            ClusterCommand::OnOff(OnOffCommand::Off) => SET_OFF_PAYLOAD,
             ClusterCommand::OnOff(OnOffCommand::Toggle) => {
-                let next = if self.on_off.on_off { "OFF" } else { "ON" };
-                serde_json::json!({ "state": next })
+                if self.on_off.on_off {
+                    SET_OFF_PAYLOAD
+                } else {
+                    SET_ON_PAYLOAD
+                }
             }
             ClusterCommand::LevelControl(LevelControlCommand::MoveToLevel { level, .. }) => {
                 if !self.supports_brightness() {
@@ -164,11 +198,15 @@ impl Light {
                         format!("Light {} does not expose LevelControl", self.entity_id).into(),
                     );
                 }
-                serde_json::json!({ "state": "ON", "brightness": level })
+                let payload = SetLevelPayload {
+                    state: "ON",
+                    brightness: *level,
+                };
+                return Ok(serde_json::to_vec(&payload)?);
             }
         };
 
-        Ok(serde_json::to_vec(&payload)?)
+        Ok(payload.to_vec())
     }
 }
 
@@ -239,6 +277,67 @@ mod tests {
         );
     }
 
+    #[test]
+    fn apply_state_payload_ignores_unconsumed_fields() {
+        let mut light = Light::from_discovery(
+            discovery_with_brightness(false),
+            "light.test".to_string(),
+            "test_node".to_string(),
+        )
+        .unwrap();
+
+        let changed = light
+            .apply_state_payload(
+                br#"{"state": "ON", "brightness": 10, "linkquality": 87, "color": {"x": 0.3, "y": 0.3}}"#,
+            )
+            .unwrap();
+        assert_eq!(changed, vec![Cluster::OnOff(OnOffCluster { on_off: true })]);
+    }
+
+    #[test]
+    fn apply_state_payload_ignores_mistyped_fields() {
+        let mut light = Light::from_discovery(
+            discovery_with_brightness(true),
+            "light.test".to_string(),
+            "test_node".to_string(),
+        )
+        .unwrap();
+
+        let changed = light
+            .apply_state_payload(br#"{"state": "ON", "brightness": "x"}"#)
+            .unwrap();
+        assert_eq!(changed, vec![Cluster::OnOff(OnOffCluster { on_off: true })]);
+        assert_eq!(light.level_control.as_ref().unwrap().current_level, None);
+    }
+
+    #[test]
+    fn apply_state_payload_skips_unchanged_clusters() {
+        let mut light = Light::from_discovery(
+            discovery_with_brightness(true),
+            "light.test".to_string(),
+            "test_node".to_string(),
+        )
+        .unwrap();
+
+        light
+            .apply_state_payload(br#"{"state": "ON", "brightness": 128}"#)
+            .unwrap();
+        let changed = light
+            .apply_state_payload(br#"{"state": "ON", "brightness": 64}"#)
+            .unwrap();
+        assert_eq!(
+            changed,
+            vec![Cluster::LevelControl(LevelControlCluster {
+                current_level: Some(64)
+            })]
+        );
+
+        let changed = light
+            .apply_state_payload(br#"{"state": "ON", "brightness": 64}"#)
+            .unwrap();
+        assert!(changed.is_empty());
+    }
+
     #[test]
     fn command_payload_for_move_to_level() {
         let light = Light::from_discovery(
@@ -260,6 +359,23 @@ mod tests {
         assert_eq!(json["brightness"], 200);
     }
 
+    #[test]
+    fn command_payload_for_on_off() {
+        let light = Light::from_discovery(
+            discovery_with_brightness(false),
+            "light.test".to_string(),
+            "test_node".to_string(),
+        )
+        .unwrap();
+        for (command, expected) in [(OnOffCommand::On, "ON"), (OnOffCommand::Off, "OFF")] {
+            let payload = light
+                .command_payload(&ClusterCommand::OnOff(command))
+                .unwrap();
+            let json: serde_json::Value = serde_json::from_slice(&payload).unwrap();
+            assert_eq!(json, serde_json::json!({ "state": expected }));
+        }
+    }
+
     #[test]
     fn command_payload_for_toggle_uses_cached_state() {
         let mut light = Light::from_discovery(
@@ -6,9 +6,11 @@ use std::sync::atomic::Ordering;
 
 use async_trait::async_trait;
 use tokio::sync::Mutex;
+use tokio::sync::mpsc;
 use tokio::task::JoinHandle;
 use tracing::debug;
 use tracing::info;
+use tracing::trace;
 use tracing::warn;
 
 use super::MqttConfig;
@@ -33,6 +35,7 @@ const INTEGRATION_NAME: &str = "mqtt";
 
 /// MQTT-side entity. The integration owns one of these per discovered node;
 /// the engine sees only `Node`s built from these.
+#[derive(Clone)]
 enum MqttEntity {
     Light(Arc<Mutex<Light>>),
     BinarySensor(Arc<Mutex<BinarySensor>>),
@@ -42,14 +45,39 @@ enum MqttEntity {
 #[derive(Default)]
 struct Inner {
     entities: HashMap<NodeId, MqttEntity>,
-    /// Reverse index: state-update topic → NodeId
-    topic_to_node: HashMap<String, NodeId>,
+    /// Reverse index: state-update topic → (NodeId, entity handle), so a
+    /// state update resolves its entity with a single lookup
+    topic_to_entity: HashMap<String, (NodeId, MqttEntity)>,
+    /// Forward index: NodeId → state-update topic, so removal doesn't have
+    /// to scan `topic_to_entity`
+    node_to_topic: HashMap<NodeId, String>,
     /// Reverse index: entity_id alias → NodeId (for re-discovery / removal)
     entity_to_node: HashMap<String, NodeId>,
 }
 
 type SharedInner = Arc<Mutex<Inner>>;
 
+/// Wrap an entity parsing error as an `InvalidData` I/O error.
+///
+/// The entity types return plain `Box<dyn Error>`, which isn't `Send` and
+/// so can't cross the integration boundary as-is.
+fn invalid_data(e: Box<dyn Error>) -> Box<dyn Error + Send> {
+    Box::new(std::io::Error::new(
+        std::io::ErrorKind::InvalidData,
+        e.to_string(),
+    ))
+}
+
+/// Shared context owned by the message processing task and threaded
+/// through the discovery and state-update handlers.
+struct MessageContext<C> {
+    client: Arc<Mutex<C>>,
+    config: MqttConfig,
+    inner: SharedInner,
+    next_node_id: Arc<AtomicU64>,
+    to_engine: FromIntegrationSender,
+}
+
 /// MQTT Integration for hearthd.
 ///
 /// Translates between Zigbee2MQTT and the Matter-shaped engine API. All
@@ -60,8 +88,8 @@ pub struct MqttIntegration<C: MqttClient> {
     inner: SharedInner,
     next_node_id: Arc<AtomicU64>,
     to_engine: Option<FromIntegrationSender>,
-    /// Handle to the background message processing task
-    _message_task: Option<JoinHandle<()>>,
+    /// Handle to the background message processing task, aborted on shutdown
+    message_task: Option<JoinHandle<()>>,
 }
 
 impl<C: MqttClient> MqttIntegration<C> {
@@ -73,68 +101,39 @@ impl<C: MqttClient> MqttIntegration<C> {
             inner: Arc::new(Mutex::new(Inner::default())),
             next_node_id: Arc::new(AtomicU64::new(1)),
             to_engine: None,
-            _message_task: None,
+            message_task: None,
         }
     }
 
     /// Process incoming MQTT messages in a background task.
+    ///
+    /// The task owns the message stream outright, so the client lock is only
+    /// taken for subscribes triggered by discovery.
     async fn process_messages_task(
-        client: Arc<Mutex<C>>,
-        config: MqttConfig,
-        inner: SharedInner,
-        next_node_id: Arc<AtomicU64>,
-        to_engine: FromIntegrationSender,
+        mut messages: mpsc::UnboundedReceiver<MqttMessage>,
+        ctx: MessageContext<C>,
     ) {
-        loop {
-            let msg = {
-                let mut client_guard = client.lock().await;
-                tokio::time::timeout(
-                    std::time::Duration::from_millis(100),
-                    client_guard.poll_message(),
-                )
-                .await
-                .unwrap_or_default()
-            };
-
-            match msg {
-                Some(msg) => {
-                    info!("Received message on topic: {}", msg.topic);
-
-                    if msg.topic.ends_with("/config") {
-                        if let Err(e) = Self::handle_discovery(
-                            &msg,
-                            &config,
-                            &client,
-                            &inner,
-                            &next_node_id,
-                            &to_engine,
-                        )
-                        .await
-                        {
-                            warn!("Error handling discovery message: {}", e);
-                        }
-                    } else if let Err(e) = Self::handle_state_update(&msg, &inner, &to_engine).await
-                    {
-                        warn!("Error handling state update: {}", e);
-                    }
-                }
-                None => {
-                    tokio::task::yield_now().await;
+        while let Some(msg) = messages.recv().await {
+            trace!("Received message on topic: {}", msg.topic);
+
+            if msg.topic.ends_with("/config") {
+                if let Err(e) = Self::handle_discovery(&msg, &ctx).await {
+                    warn!("Error handling discovery message: {}", e);
                 }
+            } else if let Err(e) = Self::handle_state_update(&msg, &ctx).await {
+                warn!("Error handling state update: {}", e);
             }
         }
+
+        info!("MQTT message stream closed");
     }
 
     async fn handle_discovery(
         msg: &MqttMessage,
-        config: &MqttConfig,
-        client: &Arc<Mutex<C>>,
-        inner: &SharedInner,
-        next_node_id: &AtomicU64,
-        to_engine: &FromIntegrationSender,
+        ctx: &MessageContext<C>,
     ) -> Result<(), Box<dyn Error + Send>> {
         let (component, node_id_str, object_id) =
-            parse_discovery_topic(&msg.topic, &config.discovery_prefix).ok_or_else(
+            parse_discovery_topic(&msg.topic, &ctx.config.discovery_prefix).ok_or_else(
                 || -> Box<dyn Error + Send> {
                     Box::new(std::io::Error::new(
                         std::io::ErrorKind::InvalidData,
@@ -148,31 +147,13 @@ impl<C: MqttClient> MqttIntegration<C> {
             component, node_id_str, object_id
         );
 
-        match component.as_str() {
-            "light" => {
-                Self::handle_light_discovery(
-                    msg,
-                    client,
-                    inner,
-                    next_node_id,
-                    to_engine,
-                    &node_id_str,
-                )
-                .await
-            }
+        match component {
+            "light" => Self::handle_light_discovery(msg, ctx, node_id_str).await,
             "binary_sensor" => {
                 // TODO: Z2M also publishes auxiliary `sensor` components
                 // (battery, linkquality, illuminance) that should become
                 // their own Matter clusters.
-                Self::handle_binary_sensor_discovery(
-                    msg,
-                    client,
-                    inner,
-                    next_node_id,
-                    to_engine,
-                    &node_id_str,
-                )
-                .await
+                Self::handle_binary_sensor_discovery(msg, ctx, node_id_str).await
             }
             _ => {
                 debug!("Ignoring unsupported component: {}", component);
@@ -183,90 +164,36 @@ impl<C: MqttClient> MqttIntegration<C> {
 
     async fn handle_light_discovery(
         msg: &MqttMessage,
-        client: &Arc<Mutex<C>>,
-        inner: &SharedInner,
-        next_node_id: &AtomicU64,
-        to_engine: &FromIntegrationSender,
+        ctx: &MessageContext<C>,
         z2m_node_id: &str,
     ) -> Result<(), Box<dyn Error + Send>> {
         let entity_id = format!("light.{}", z2m_node_id);
 
-        // Empty payload = retained discovery deletion
-        if msg.payload.is_empty() {
-            Self::remove_entity_by_alias(&entity_id, inner, to_engine).await;
+        let Some(discovery) = Self::parse_new_discovery(msg, ctx, &entity_id).await? else {
             return Ok(());
-        }
-
-        // Already-known entity: ignore (Z2M can re-publish discovery)
-        {
-            let guard = inner.lock().await;
-            if guard.entity_to_node.contains_key(&entity_id) {
-                debug!("Ignoring re-discovery for {}", entity_id);
-                return Ok(());
-            }
-        }
-
-        let discovery: DiscoveryMessage = serde_json::from_slice(&msg.payload)
-            .map_err(|e| -> Box<dyn Error + Send> { Box::new(e) })?;
+        };
 
         let light = Light::from_discovery(discovery, entity_id.clone(), z2m_node_id.to_string())
-            .map_err(|e| -> Box<dyn Error + Send> {
-                Box::new(std::io::Error::new(
-                    std::io::ErrorKind::InvalidData,
-                    e.to_string(),
-                ))
-            })?;
+            .map_err(invalid_data)?;
 
         let state_topic = light.state_topic.clone();
         let node = light.to_node(INTEGRATION_NAME);
         info!("Discovered light entity: {} ({})", light.name, entity_id);
 
-        let node_id = next_node_id.fetch_add(1, Ordering::Relaxed);
-        let light_arc = Arc::new(Mutex::new(light));
-
-        {
-            let mut guard = inner.lock().await;
-            guard.entities.insert(node_id, MqttEntity::Light(light_arc));
-            guard.topic_to_node.insert(state_topic.clone(), node_id);
-            guard.entity_to_node.insert(entity_id, node_id);
-        }
-
-        // Subscribe after registering so the retained state message routes correctly.
-        {
-            let mut client_guard = client.lock().await;
-            client_guard.subscribe(&state_topic).await?;
-        }
-
-        Self::send_node_added(node_id, node, to_engine).await;
-
-        Ok(())
+        let entity = MqttEntity::Light(Arc::new(Mutex::new(light)));
+        Self::register_entity(ctx, entity_id, state_topic, entity, node).await
     }
 
     async fn handle_binary_sensor_discovery(
         msg: &MqttMessage,
-        client: &Arc<Mutex<C>>,
-        inner: &SharedInner,
-        next_node_id: &AtomicU64,
-        to_engine: &FromIntegrationSender,
+        ctx: &MessageContext<C>,
         z2m_node_id: &str,
     ) -> Result<(), Box<dyn Error + Send>> {
         let entity_id = format!("binary_sensor.{}", z2m_node_id);
 
-        if msg.payload.is_empty() {
-            Self::remove_entity_by_alias(&entity_id, inner, to_engine).await;
+        let Some(discovery) = Self::parse_new_discovery(msg, ctx, &entity_id).await? else {
             return Ok(());
-        }
-
-        {
-            let guard = inner.lock().await;
-            if guard.entity_to_node.contains_key(&entity_id) {
-                debug!("Ignoring re-discovery for {}", entity_id);
-                return Ok(());
-            }
-        }
-
-        let discovery: DiscoveryMessage = serde_json::from_slice(&msg.payload)
-            .map_err(|e| -> Box<dyn Error + Send> { Box::new(e) })?;
+        };
 
         // Only motion-style sensors map to Matter's OccupancySensing cluster.
         // Z2M reports many other binary-sensor device classes (door, vibration,
@@ -285,12 +212,7 @@ impl<C: MqttClient> MqttIntegration<C> {
 
         let sensor =
             BinarySensor::from_discovery(discovery, entity_id.clone(), z2m_node_id.to_string())
-                .map_err(|e| -> Box<dyn Error + Send> {
-                    Box::new(std::io::Error::new(
-                        std::io::ErrorKind::InvalidData,
-                        e.to_string(),
-                    ))
-                })?;
+                .map_err(invalid_data)?;
 
         let state_topic = sensor.state_topic.clone();
         let node = sensor.to_node(INTEGRATION_NAME);
@@ -299,24 +221,68 @@ impl<C: MqttClient> MqttIntegration<C> {
             sensor.name, entity_id
         );
 
-        let node_id = next_node_id.fetch_add(1, Ordering::Relaxed);
-        let sensor_arc = Arc::new(Mutex::new(sensor));
+        let entity = MqttEntity::BinarySensor(Arc::new(Mutex::new(sensor)));
+        Self::register_entity(ctx, entity_id, state_topic, entity, node).await
+    }
 
+    /// Common front half of component discovery.
+    ///
+    /// Handles retained-deletion (empty payload) and re-discovery of an
+    /// already-known entity, returning `None` in both cases. Otherwise parses
+    /// the discovery payload.
+    async fn parse_new_discovery(
+        msg: &MqttMessage,
+        ctx: &MessageContext<C>,
+        entity_id: &str,
+    ) -> Result<Option<DiscoveryMessage>, Box<dyn Error + Send>> {
+        // Empty payload = retained discovery deletion
+        if msg.payload.is_empty() {
+            Self::remove_entity_by_alias(entity_id, &ctx.inner, &ctx.to_engine).await;
+            return Ok(None);
+        }
+
+        // Already-known entity: ignore (Z2M can re-publish discovery)
         {
-            let mut guard = inner.lock().await;
+            let guard = ctx.inner.lock().await;
+            if guard.entity_to_node.contains_key(entity_id) {
+                debug!("Ignoring re-discovery for {}", entity_id);
+                return Ok(None);
+            }
+        }
+
+        let discovery = serde_json::from_slice(&msg.payload)
+            .map_err(|e| -> Box<dyn Error + Send> { Box::new(e) })?;
+        Ok(Some(discovery))
+    }
+
+    /// Common back half of component discovery: allocate a node ID, index the
+    /// entity, subscribe to its state topic and announce it to the engine.
+    async fn register_entity(
+        ctx: &MessageContext<C>,
+        entity_id: String,
+        state_topic: String,
+        entity: MqttEntity,
+        node: crate::matter::Node,
+    ) -> Result<(), Box<dyn Error + Send>> {
+        let node_id = ctx.next_node_id.fetch_add(1, Ordering::Relaxed);
+
+        {
+            let mut guard = ctx.inner.lock().await;
             guard
-                .entities
-                .insert(node_id, MqttEntity::BinarySensor(sensor_arc));
-            guard.topic_to_node.insert(state_topic.clone(), node_id);
+                .topic_to_entity
+                .insert(state_topic.clone(), (node_id, entity.clone()));
+            guard.node_to_topic.insert(node_id, state_topic.clone());
+            guard.entities.insert(node_id, entity);
             guard.entity_to_node.insert(entity_id, node_id);
         }
 
+        // Subscribe after registering so the retained state message routes correctly.
         {
-            let mut client_guard = client.lock().await;
+            let mut client_guard = ctx.client.lock().await;
             client_guard.subscribe(&state_topic).await?;
         }
 
-        Self::send_node_added(node_id, node, to_engine).await;
+        Self::send_node_added(node_id, node, &ctx.to_engine).await;
 
         Ok(())
     }
@@ -329,10 +295,18 @@ impl<C: MqttClient> MqttIntegration<C> {
     ) {
         let removed = {
             let mut guard = inner.lock().await;
-            if let Some(&node_id) = guard.entity_to_node.get(entity_id) {
-                guard.entity_to_node.remove(entity_id);
+            if let Some(node_id) = guard.entity_to_node.remove(entity_id) {
                 guard.entities.remove(&node_id);
-                guard.topic_to_node.retain(|_, &mut v| v != node_id);
+                if let Some(topic) = guard.node_to_topic.remove(&node_id) {
+                    // Another node may since have claimed the same topic.
+                    if guard
+                        .topic_to_entity
+                        .get(&topic)
+                        .is_some_and(|(owner, _)| *owner == node_id)
+                    {
+                        guard.topic_to_entity.remove(&topic);
+                    }
+                }
                 Some(node_id)
             } else {
                 None
@@ -382,56 +356,41 @@ impl<C: MqttClient> MqttIntegration<C> {
 
     async fn handle_state_update(
         msg: &MqttMessage,
-        inner: &SharedInner,
-        to_engine: &FromIntegrationSender,
+        ctx: &MessageContext<C>,
     ) -> Result<(), Box<dyn Error + Send>> {
         // Resolve topic → (NodeId, entity handle) and release the outer lock
         // before parsing the payload.
         let (node_id, entity) = {
-            let guard = inner.lock().await;
-            let node_id = match guard.topic_to_node.get(&msg.topic) {
-                Some(id) => *id,
+            let guard = ctx.inner.lock().await;
+            match guard.topic_to_entity.get(&msg.topic) {
+                Some((node_id, entity)) => (*node_id, entity.clone()),
                 None => return Ok(()),
-            };
-            let entity = match guard.entities.get(&node_id) {
-                Some(MqttEntity::Light(l)) => MqttEntity::Light(l.clone()),
-                Some(MqttEntity::BinarySensor(b)) => MqttEntity::BinarySensor(b.clone()),
-                None => return Ok(()),
-            };
-            (node_id, entity)
+            }
         };
 
         match entity {
             MqttEntity::Light(light_arc) => {
                 let clusters = {
                     let mut light = light_arc.lock().await;
-                    light.apply_state_payload(&msg.payload).map_err(
-                        |e| -> Box<dyn Error + Send> {
-                            Box::new(std::io::Error::new(
-                                std::io::ErrorKind::InvalidData,
-                                e.to_string(),
-                            ))
-                        },
-                    )?
+                    light
+                        .apply_state_payload(&msg.payload)
+                        .map_err(invalid_data)?
                 };
                 for cluster in clusters {
-                    Self::send_attribute_changed(node_id, Z2M_ENDPOINT, cluster, to_engine).await;
+                    Self::send_attribute_changed(node_id, Z2M_ENDPOINT, cluster, &ctx.to_engine)
+                        .await;
                 }
             }
             MqttEntity::BinarySensor(sensor_arc) => {
                 let cluster = {
                     let mut sensor = sensor_arc.lock().await;
-                    sensor.apply_state_payload(&msg.payload).map_err(
-                        |e| -> Box<dyn Error + Send> {
-                            Box::new(std::io::Error::new(
-                                std::io::ErrorKind::InvalidData,
-                                e.to_string(),
-                            ))
-                        },
-                    )?
+                    sensor
+                        .apply_state_payload(&msg.payload)
+                        .map_err(invalid_data)?
                 };
                 if let Some(cluster) = cluster {
-                    Self::send_attribute_changed(node_id, Z2M_ENDPOINT, cluster, to_engine).await;
+                    Self::send_attribute_changed(node_id, Z2M_ENDPOINT, cluster, &ctx.to_engine)
+                        .await;
                 }
             }
         }
@@ -532,17 +491,31 @@ impl<C: MqttClient + 'static> Integration for MqttIntegration<C> {
             client.subscribe(&binary_sensor_discovery).await?;
         }
 
+        let messages = {
+            let mut client = self.client.lock().await;
+            client.take_messages()
+        }
+        .ok_or_else(|| -> Box<dyn Error + Send> {
+            Box::new(std::io::Error::new(
+                std::io::ErrorKind::NotConnected,
+                "MQTT message stream unavailable",
+            ))
+        })?;
+
         info!("MQTT integration setup complete, spawning message processing task...");
 
-        let client = self.client.clone();
-        let config = self.config.clone();
-        let inner = self.inner.clone();
-        let next_node_id = self.next_node_id.clone();
+        let ctx = MessageContext {
+            client: self.client.clone(),
+            config: self.config.clone(),
+            inner: self.inner.clone(),
+            next_node_id: self.next_node_id.clone(),
+            to_engine: tx,
+        };
 
         let task = tokio::spawn(async move {
-            Self::process_messages_task(client, config, inner, next_node_id, tx).await;
+            Self::process_messages_task(messages, ctx).await;
         });
-        self._message_task = Some(task);
+        self.message_task = Some(task);
 
         info!("MQTT integration ready to handle commands");
         Ok(())
@@ -558,7 +531,7 @@ impl<C: MqttClient + 'static> Integration for MqttIntegration<C> {
                 endpoint_id,
                 command,
             } => {
-                info!(
+                debug!(
                     "Handling InvokeCommand for node {} endpoint {}: {:?}",
                     node_id, endpoint_id, command
                 );
@@ -570,6 +543,9 @@ impl<C: MqttClient + 'static> Integration for MqttIntegration<C> {
 
     async fn shutdown(&mut self) -> Result<(), Box<dyn Error + Send>> {
         info!("MQTT integration shutting down");
+        if let Some(task) = self.message_task.take() {
+            task.abort();
+        }
         Ok(())
     }
 }
@@ -596,23 +572,188 @@ impl TryFrom<&crate::config::IntegrationsConfig>
 mod tests {
     use super::*;
     use crate::integrations::mqtt::client::MockMqttClient;
+    use crate::matter::OnOffCluster;
 
-    #[tokio::test]
-    async fn integration_starts_empty() {
-        let client = MockMqttClient::new();
-        let config = MqttConfig {
+    fn test_config() -> MqttConfig {
+        MqttConfig {
             broker: "localhost".to_string(),
             port: 1883,
             client_id: "test".to_string(),
             discovery_prefix: "homeassistant".to_string(),
             username: None,
             password: None,
+        }
+    }
+
+    fn light_discovery_payload(state_topic: &str) -> Vec<u8> {
+        format!(
+            r#"{{"name": "Lamp", "state_topic": "{}", "command_topic": "{}/set"}}"#,
+            state_topic, state_topic
+        )
+        .into_bytes()
+    }
+
+    /// Run setup() over a fixed message queue and wait for the message task
+    /// to drain it, returning everything sent to the engine.
+    async fn run_messages(
+        messages: Vec<(&str, Vec<u8>)>,
+    ) -> (MqttIntegration<MockMqttClient>, Vec<FromIntegrationMessage>) {
+        let mut client = MockMqttClient::new();
+        for (topic, payload) in messages {
+            client.add_message(topic.to_string(), payload, true);
+        }
+        let mut integration = MqttIntegration::new(client, &test_config());
+
+        let (tx, mut rx) = mpsc::channel(16);
+        integration.setup(tx).await.unwrap();
+        integration.message_task.take().unwrap().await.unwrap();
+
+        let mut events = Vec::new();
+        while let Ok(event) = rx.try_recv() {
+            events.push(event);
+        }
+        (integration, events)
+    }
+
+    #[tokio::test]
+    async fn integration_starts_empty() {
+        let client = MockMqttClient::new();
+        let integration = MqttIntegration::new(client, &test_config());
+
+        let guard = integration.inner.lock().await;
+        assert!(guard.entities.is_empty());
+        assert!(guard.topic_to_entity.is_empty());
+        assert!(guard.node_to_topic.is_empty());
+        assert!(guard.entity_to_node.is_empty());
+    }
+
+    #[tokio::test]
+    async fn setup_routes_discovery_then_state_to_engine() {
+        let mut client = MockMqttClient::new();
+        client.add_message(
+            "homeassistant/light/0x01/light/config".to_string(),
+            br#"{"name": "Lamp", "state_topic": "zigbee2mqtt/lamp", "command_topic": "zigbee2mqtt/lamp/set"}"#.to_vec(),
+            true,
+        );
+        client.add_message(
+            "zigbee2mqtt/lamp".to_string(),
+            br#"{"state": "ON"}"#.to_vec(),
+            true,
+        );
+        let mut integration = MqttIntegration::new(client, &test_config());
+
+        let (tx, mut rx) = mpsc::channel(8);
+        integration.setup(tx).await.unwrap();
+
+        let added_id = match rx.recv().await {
+            Some(FromIntegrationMessage::NodeAdded { node_id, node }) => {
+                assert_eq!(node.entity_id, "light.0x01");
+                node_id
+            }
+            other => panic!("expected NodeAdded, got {:?}", other),
         };
-        let integration = MqttIntegration::new(client, &config);
+        match rx.recv().await {
+            Some(FromIntegrationMessage::AttributeChanged {
+                node_id,
+                endpoint_id,
+                cluster,
+            }) => {
+                assert_eq!(node_id, added_id);
+                assert_eq!(endpoint_id, Z2M_ENDPOINT);
+                assert_eq!(cluster, Cluster::OnOff(OnOffCluster { on_off: true }));
+            }
+            other => panic!("expected AttributeChanged, got {:?}", other),
+        }
+
+        {
+            let client = integration.client.lock().await;
+            assert!(
+                client
+                    .subscriptions
+                    .contains(&"zigbee2mqtt/lamp".to_string())
+            );
+        }
+        assert!(integration.client.lock().await.take_messages().is_none());
+
+        integration.shutdown().await.unwrap();
+    }
+
+    #[tokio::test]
+    async fn retained_deletion_removes_entity_and_routing() {
+        let (integration, events) = run_messages(vec![
+            (
+                "homeassistant/light/0x01/light/config",
+                light_discovery_payload("zigbee2mqtt/lamp"),
+            ),
+            ("homeassistant/light/0x01/light/config", Vec::new()),
+            ("zigbee2mqtt/lamp", br#"{"state": "ON"}"#.to_vec()),
+        ])
+        .await;
+
+        assert!(
+            matches!(
+                events.as_slice(),
+                [
+                    FromIntegrationMessage::NodeAdded { node_id: added, .. },
+                    FromIntegrationMessage::NodeRemoved { node_id: removed },
+                ] if added == removed
+            ),
+            "unexpected engine events: {:?}",
+            events
+        );
 
         let guard = integration.inner.lock().await;
         assert!(guard.entities.is_empty());
-        assert!(guard.topic_to_node.is_empty());
+        assert!(guard.topic_to_entity.is_empty());
+        assert!(guard.node_to_topic.is_empty());
         assert!(guard.entity_to_node.is_empty());
     }
+
+    #[tokio::test]
+    async fn removing_node_keeps_newer_owner_of_shared_topic() {
+        let (integration, events) = run_messages(vec![
+            (
+                "homeassistant/light/0x01/light/config",
+                light_discovery_payload("zigbee2mqtt/shared"),
+            ),
+            (
+                "homeassistant/light/0x02/light/config",
+                light_discovery_payload("zigbee2mqtt/shared"),
+            ),
+            ("homeassistant/light/0x01/light/config", Vec::new()),
+            ("zigbee2mqtt/shared", br#"{"state": "ON"}"#.to_vec()),
+        ])
+        .await;
+
+        let newer = match events.as_slice() {
+            [
+                FromIntegrationMessage::NodeAdded { node_id: older, .. },
+                FromIntegrationMessage::NodeAdded { node_id: newer, .. },
+                FromIntegrationMessage::NodeRemoved { node_id: removed },
+                FromIntegrationMessage::AttributeChanged {
+                    node_id: changed,
+                    cluster,
+                    ..
+                },
+            ] if removed == older && changed == newer => {
+                assert_eq!(*cluster, Cluster::OnOff(OnOffCluster { on_off: true }));
+                *newer
+            }
+            other => panic!("unexpected engine events: {:?}", other),
+        };
+
+        let guard = integration.inner.lock().await;
+        assert_eq!(
+            guard
+                .topic_to_entity
+                .get("zigbee2mqtt/shared")
+                .map(|(id, _)| *id),
+            Some(newer)
+        );
+        assert_eq!(guard.node_to_topic.len(), 1);
+        assert_eq!(
+            guard.node_to_topic.get(&newer).map(String::as_str),
+            Some("zigbee2mqtt/shared")
+        );
+    }
 }